@@ -2,6 +2,7 @@
 """
 DevCheck: Enhanced local health test for Python & C++
 - Python: venv per project, install requirements.txt, run entry, expect "working"
+  (stdlib-only entries without requirements run on the current interpreter)
 - C++: find/boot CMake, detect compiler, configure+build (Ninja if present, VS on Windows), run target, expect "Working"
 
 Usage:
@@ -13,8 +14,13 @@ Exit code: 0 if all PASS (or SKIP when allowed), 1 if any FAIL.
 """
 
 import argparse
+import ast
+import copy
+import functools
+import hashlib
 import json
 import logging
+import multiprocessing
 import os
 import platform
 import re
@@ -24,13 +30,22 @@ import sys
 import tempfile
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from contextlib import contextmanager
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
 from dataclasses import dataclass, asdict
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Dict, List, Optional, Pattern, Tuple, Union
 import stat  # <-- added for Windows read-only fix
 
+try:
+    import orjson  # optional: much faster report serialization
+except ImportError:
+    orjson = None
+
+_SYSTEM = platform.system()
+_IS_WINDOWS = _SYSTEM == "Windows"
+
 # -------------------- Configuration & Data Classes --------------------
 
 @dataclass
@@ -79,24 +94,33 @@ class ColoredFormatter(logging.Formatter):
         'CRITICAL': '\033[35m', # Magenta
     }
     RESET = '\033[0m'
+    def __init__(self, *args, no_color: bool = False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.no_color = no_color
     def format(self, record):
-        if hasattr(record, 'no_color') or not sys.stdout.isatty():
+        if self.no_color or not sys.stdout.isatty():
             return super().format(record)
         color = self.COLORS.get(record.levelname, '')
         record.levelname = f"{color}{record.levelname}{self.RESET}"
         return super().format(record)
 
-def setup_logging(verbose: bool = False) -> logging.Logger:
+def setup_logging(verbose: bool = False, no_color: bool = False) -> logging.Logger:
     level = logging.DEBUG if verbose else logging.INFO
     logger = logging.getLogger('devcheck')
     logger.setLevel(level)
     if not logger.handlers:
         handler = logging.StreamHandler()
-        formatter = ColoredFormatter('%(asctime)s [%(levelname)s] %(message)s', datefmt='%H:%M:%S')
+        formatter = ColoredFormatter('%(asctime)s [%(levelname)s] %(message)s', datefmt='%H:%M:%S',
+                                     no_color=no_color)
         handler.setFormatter(formatter)
         logger.addHandler(handler)
     return logger
 
+class PrefixAdapter(logging.LoggerAdapter):
+    """Prefix messages so output from phases running concurrently stays readable."""
+    def process(self, msg, kwargs):
+        return f"[{self.extra['prefix']}] {msg}", kwargs
+
 def print_header(title: str, char: str = "=", width: int = 80):
     print(f"\n{char * width}")
     print(f"{title:^{width}}")
@@ -104,51 +128,91 @@ def print_header(title: str, char: str = "=", width: int = 80):
 
 # -------------------- Utility Functions --------------------
 
+@functools.lru_cache(maxsize=None)
 def which(prog: str) -> Optional[str]:
     result = shutil.which(prog)
-    if not result and platform.system() == "Windows" and not prog.endswith('.exe'):
+    if not result and _IS_WINDOWS and not prog.endswith('.exe'):
         result = shutil.which(f"{prog}.exe")
     return result
 
-@contextmanager
-def timeout_context(seconds: int):
-    def timeout_handler():
-        raise TimeoutError(f"Operation timed out after {seconds} seconds")
-    timer = threading.Timer(seconds, timeout_handler)
-    timer.start()
-    try:
-        yield
-    finally:
-        timer.cancel()
+OUTPUT_TAIL_LINES = 1024
+# Shared grace period for the pipe readers once the process has exited
+READER_JOIN_TIMEOUT = 2.0
+
+def _drain_pipe(stream, buf: deque, expect: Optional[Pattern[str]], seen: threading.Event):
+    for line in stream:
+        buf.append(line)
+        if expect is not None and not seen.is_set() and expect.search(line):
+            seen.set()
+    stream.close()
 
 def run_cmd(args: List[str], cwd: Optional[str] = None, env: Optional[Dict] = None, 
            timeout: int = 300) -> Tuple[int, str, str]:
+    """Run a command, keeping only the last OUTPUT_TAIL_LINES lines of stdout/stderr."""
+    rc, out, err, _ = run_cmd_expect(args, None, cwd=cwd, env=env, timeout=timeout)
+    return rc, out, err
+
+def run_cmd_expect(args: List[str], expect: Optional[Pattern[str]], cwd: Optional[str] = None,
+                   env: Optional[Dict] = None, timeout: int = 300) -> Tuple[int, str, str, bool]:
+    """Like run_cmd, also reporting whether any output line matched expect.
+
+    Both pipes are drained by reader threads while the process runs, so large
+    output can neither fill the pipe buffer (deadlock) nor pile up in memory.
+    expect is checked against every line as it is read, so a match is found
+    even when it has scrolled out of the returned tail.
+    If a grandchild keeps the pipes open after the process exits, the readers
+    get READER_JOIN_TIMEOUT seconds in total; output after that is dropped.
+    """
     logger = logging.getLogger('devcheck')
     logger.debug(f"Running: {' '.join(map(str, args))}")
     if cwd:
         logger.debug(f"Working directory: {cwd}")
     try:
-        with timeout_context(timeout):
-            p = subprocess.run(
-                args, 
-                cwd=cwd, 
-                env=env, 
-                text=True, 
-                capture_output=True,
-                timeout=timeout
-            )
-            return p.returncode, p.stdout or "", p.stderr or ""
+        proc = subprocess.Popen(
+            args,
+            cwd=cwd,
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            errors="replace",
+            bufsize=-1
+        )
+        out_buf: deque = deque(maxlen=OUTPUT_TAIL_LINES)
+        err_buf: deque = deque(maxlen=OUTPUT_TAIL_LINES)
+        seen = threading.Event()
+        readers = [threading.Thread(target=_drain_pipe, args=(proc.stdout, out_buf, expect, seen), daemon=True),
+                   threading.Thread(target=_drain_pipe, args=(proc.stderr, err_buf, expect, seen), daemon=True)]
+        for reader in readers:
+            reader.start()
+        try:
+            proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            raise
+        finally:
+            deadline = time.monotonic() + READER_JOIN_TIMEOUT
+            for reader in readers:
+                reader.join(timeout=max(0.0, deadline - time.monotonic()))
+        return proc.returncode, "".join(out_buf), "".join(err_buf), seen.is_set()
     except subprocess.TimeoutExpired:
-        return -1, "", f"Command timed out after {timeout} seconds"
+        return -1, "", f"Command timed out after {timeout} seconds", False
     except Exception as e:
-        return -1, "", str(e)
+        return -1, "", str(e), False
+
+_CONFIG_CACHE: Dict[Tuple[str, int], Dict] = {}
 
 def load_config(cfg_path: Path) -> Dict:
-    if not cfg_path.exists():
+    try:
+        cache_key = (str(cfg_path), cfg_path.stat().st_mtime_ns)
+    except OSError:
         return {}
     try:
-        with cfg_path.open("r", encoding="utf-8") as f:
-            config = json.load(f)
+        if cache_key not in _CONFIG_CACHE:
+            with cfg_path.open("r", encoding="utf-8") as f:
+                _CONFIG_CACHE[cache_key] = json.load(f)
+        config = copy.deepcopy(_CONFIG_CACHE[cache_key])
         if 'python_projects' in config:
             projects = []
             for proj in config['python_projects']:
@@ -166,58 +230,153 @@ def load_config(cfg_path: Path) -> Dict:
         logging.getLogger('devcheck').error(f"Invalid config file {cfg_path}: {e}")
         return {}
 
+DEFAULT_ENTRY_NAMES = ("main.py", "app.py", "run.py", "__main__.py", "cli.py")
+_SKIP_DIR_NAMES = {"venv", "node_modules"}
+_NOT_A_PROJECT_MARKERS = {".git", "venv", ".venv"}
+
+def _scan_tree(search_dirs: List[Path]) -> Tuple[List[Tuple[str, List[str]]], str]:
+    """Walk search_dirs once with os.scandir.
+
+    Returns every directory found below a search dir together with the entry
+    files / marker names it contains, plus a fingerprint of directory and
+    entry-file mtimes used to validate the discovery cache.
+    """
+    stamps = []
+    stack = []
+    for d in search_dirs:
+        try:
+            stamps.append(f"{d}:{d.stat().st_mtime_ns}")
+            stack.append(str(d))
+        except OSError:
+            continue
+    contents: Dict[str, List[str]] = {}
+    found: List[str] = []
+    while stack:
+        d = stack.pop()
+        if d in contents:
+            continue
+        names = []
+        try:
+            with os.scandir(d) as it:
+                for ent in it:
+                    if ent.name in _NOT_A_PROJECT_MARKERS:
+                        names.append(ent.name)
+                    if ent.is_dir(follow_symlinks=False):
+                        if ent.name.startswith('.') or ent.name in _SKIP_DIR_NAMES:
+                            continue
+                        stack.append(ent.path)
+                        found.append(ent.path)
+                    elif ent.name in DEFAULT_ENTRY_NAMES:
+                        names.append(ent.name)
+                    else:
+                        continue
+                    stamps.append(f"{ent.path}:{ent.stat(follow_symlinks=False).st_mtime_ns}")
+        except OSError:
+            pass
+        contents[d] = names
+    stamps.sort()
+    fingerprint = hashlib.blake2b("\n".join(stamps).encode("utf-8"), digest_size=16).hexdigest()
+    return [(d, contents.get(d, [])) for d in dict.fromkeys(found)], fingerprint
+
 def discover_python_projects(root: Path) -> List[PythonProject]:
-    DEFAULT_ENTRY_NAMES = ("main.py", "app.py", "run.py", "__main__.py", "cli.py")
-    projects = []
     search_dirs = [root / "src", root / "scripts", root / "python", root]
-    for search_dir in search_dirs:
-        if not search_dir.exists():
+    cache_path = root / ".devcheck" / "discovery_cache.json"
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    candidates, fingerprint = _scan_tree(search_dirs)
+    try:
+        cached = json.loads(cache_path.read_text(encoding="utf-8"))
+        if cached.get("fingerprint") == fingerprint:
+            return [PythonProject(**proj) for proj in cached["projects"]]
+    except Exception:
+        pass
+    projects = []
+    for proj_dir, names in candidates:
+        if not _NOT_A_PROJECT_MARKERS.isdisjoint(names):
             continue
-        for p in search_dir.rglob("*"):
-            if not p.is_dir() or p.name.startswith('.'):
+        for entry_name in DEFAULT_ENTRY_NAMES:
+            if entry_name not in names:
                 continue
-            if any((p / skip).exists() for skip in ['.git', 'venv', '.venv']):
+            try:
+                # Only look at the head and tail of the script (where the markers live),
+                # without decoding, instead of reading large entry files in full.
+                with open(os.path.join(proj_dir, entry_name), 'rb') as f:
+                    buf = f.read(8192)
+                    if b'if __name__' not in buf and b'def main' not in buf:
+                        f.seek(max(8192, os.fstat(f.fileno()).st_size - 8192))
+                        buf = f.read(8192)
+                if b'if __name__' in buf or b'def main' in buf:
+                    projects.append(PythonProject(
+                        path=str(Path(proj_dir).relative_to(root)).replace("\\", "/"),
+                        entry=entry_name
+                    ))
+                    break
+            except OSError:
                 continue
-            for entry_name in DEFAULT_ENTRY_NAMES:
-                entry_path = p / entry_name
-                if entry_path.exists():
-                    try:
-                        content = entry_path.read_text(encoding='utf-8', errors='ignore')
-                        if 'if __name__' in content or 'def main' in content:
-                            projects.append(PythonProject(
-                                path=str(p.relative_to(root)).replace("\\", "/"),
-                                entry=entry_name
-                            ))
-                            break
-                    except Exception:
-                        continue
+    try:
+        cache_path.write_text(json.dumps({"fingerprint": fingerprint, "projects": [asdict(p) for p in projects]}), encoding="utf-8")
+    except OSError:
+        pass
     return projects
 
 # -------------------- Mandatory Cleanup --------------------
 
+def _make_writable(path: Path, is_dir: bool):
+    """Set write permission on path and, for directories, everything below it.
+
+    One os.scandir pass up front (DirEntry.stat is free on Windows) instead of
+    chmod-and-retry from an rmtree error callback, one file at a time.
+    """
+    def fix(p: str, mode: int, dir_: bool):
+        wanted = mode | (stat.S_IRWXU if dir_ else stat.S_IWRITE)
+        if wanted != mode:
+            os.chmod(p, wanted)
+    try:
+        fix(str(path), path.lstat().st_mode, is_dir)
+    except OSError:
+        return
+    stack = [str(path)] if is_dir else []
+    while stack:
+        d = stack.pop()
+        try:
+            with os.scandir(d) as it:
+                for ent in it:
+                    try:
+                        if ent.is_symlink():
+                            continue
+                        dir_ = ent.is_dir(follow_symlinks=False)
+                        fix(ent.path, ent.stat(follow_symlinks=False).st_mode, dir_)
+                        if dir_:
+                            stack.append(ent.path)
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
 def safe_rmtree(path: Path, logger: Optional[logging.Logger] = None):
     """Robust rmtree that clears read-only bits on Windows and retries."""
-    if not path.exists():
+    try:
+        is_dir = stat.S_ISDIR(path.lstat().st_mode)
+    except FileNotFoundError:
         return
-    def on_rm_error(func, p, exc_info):
-        try:
-            os.chmod(p, stat.S_IWRITE)
-            func(p)
-        except Exception:
-            pass
+    if _IS_WINDOWS:
+        # venvs are full of read-only files on Windows
+        _make_writable(path, is_dir)
     for attempt in range(3):
         try:
-            if path.is_dir():
-                shutil.rmtree(path, onerror=on_rm_error)
+            if is_dir:
+                shutil.rmtree(path)
             else:
                 path.unlink(missing_ok=True)
             return
+        except FileNotFoundError:
+            return
         except Exception as e:
             if logger:
                 logger.debug(f"Retry {attempt+1} deleting {path}: {e}")
             time.sleep(0.5 * (attempt + 1))
+            _make_writable(path, is_dir)
 
-def mandatory_cleanup(root: Path, cpp_config: "CppConfig"):
+def mandatory_cleanup(root: Path, cpp_config: "CppConfig", pool: Optional[ProcessPoolExecutor] = None):
     """Delete build artifacts and any .venv_devcheck* folders before running."""
     logger = logging.getLogger('devcheck')
     print_header("CLEANUP (mandatory)")
@@ -238,18 +397,24 @@ def mandatory_cleanup(root: Path, cpp_config: "CppConfig"):
     # 3) New-style venv bucket used by this script
     targets.append(root / ".devcheck" / "venvs")
 
-    # De-duplicate & delete
-    seen = set()
-    for t in targets:
-        t = t.resolve()
-        if t in seen:
-            continue
-        seen.add(t)
+    # De-duplicate, then delete in parallel (removal is IO-bound)
+    seen = set(t.resolve() for t in targets)
+    existing: List[Path] = []
+    for t in sorted(seen):
+        if any(parent in seen for parent in t.parents):
+            continue  # removed together with its parent; deleting both concurrently would race
         if t.exists():
             logger.info(f"Cleaning: {t}")
-            safe_rmtree(t, logger=logger)
+            existing.append(t)
         else:
             logger.debug(f"Not found (skip): {t}")
+    if not existing:
+        return
+    if pool is not None:
+        list(pool.map(safe_rmtree, existing, [logger] * len(existing)))
+    else:
+        with ThreadPoolExecutor(max_workers=min(8, len(existing))) as executor:
+            list(executor.map(lambda t: safe_rmtree(t, logger=logger), existing))
 
 # -------------------- Python Environment Management --------------------
 
@@ -257,13 +422,13 @@ class PythonEnvironment:
     def __init__(self, root: Path, logger: logging.Logger):
         self.root = root
         self.logger = logger
-        self._venv_cache = {}
+        self._venv_cache: Dict[Path, Tuple[Path, Path, Path]] = {}
     def ensure_venv(self, proj_dir: Path, project: PythonProject) -> Tuple[Path, Path, Path]:
-        venv_name = f".venv_devcheck_{hash(str(proj_dir)) % 10000:04d}"
+        if proj_dir in self._venv_cache:
+            return self._venv_cache[proj_dir]
+        # hash() is salted per process; blake2b gives the same name on every run
+        venv_name = f".venv_devcheck_{hashlib.blake2b(str(proj_dir).encode('utf-8'), digest_size=4).hexdigest()}"
         venv_dir = self.root / ".devcheck" / "venvs" / venv_name
-        cache_key = str(venv_dir)
-        if cache_key in self._venv_cache:
-            return self._venv_cache[cache_key]
         py_exe = self._get_python_executable(project.python_version)
         if not venv_dir.exists():
             self.logger.info(f"Creating virtual environment at {venv_dir}")
@@ -271,7 +436,7 @@ class PythonEnvironment:
             rc, out, err = run_cmd([py_exe, "-m", "venv", str(venv_dir)])
             if rc != 0:
                 raise RuntimeError(f"Failed to create venv: {err}")
-        if platform.system() == "Windows":
+        if _IS_WINDOWS:
             vpy = venv_dir / "Scripts" / "python.exe"
             pip = venv_dir / "Scripts" / "pip.exe"
         else:
@@ -280,7 +445,7 @@ class PythonEnvironment:
         if not vpy.exists():
             raise RuntimeError(f"Venv python not found at {vpy}")
         result = (venv_dir, vpy, pip)
-        self._venv_cache[cache_key] = result
+        self._venv_cache[proj_dir] = result
         return result
     def _get_python_executable(self, version: Optional[str] = None) -> str:
         if not version:
@@ -291,29 +456,83 @@ class PythonEnvironment:
                 return candidate
         self.logger.warning(f"Python {version} not found, using {sys.executable}")
         return sys.executable
-    def install_requirements(self, proj_dir: Path, pip_path: Path, project: PythonProject):
+    def install_requirements(self, proj_dir: Path, venv_dir: Path, pip_path: Path, project: PythonProject):
         req_file = project.requirements or "requirements.txt"
         req_path = proj_dir / req_file
         if not req_path.exists():
             return
         self.logger.info(f"Installing requirements from {req_file}")
-        req_hash = hash(req_path.read_text())
-        hash_file = proj_dir / ".devcheck_req_hash"
-        if hash_file.exists() and hash_file.read_text().strip() == str(req_hash):
+        # Stable content digest (hash() is salted per process); stored inside the venv so
+        # a recreated venv never inherits a stale "already installed" marker.
+        req_hash = hashlib.blake2b(req_path.read_bytes(), digest_size=16).hexdigest()
+        hash_file = venv_dir / ".devcheck_req_hash"
+        if hash_file.exists() and hash_file.read_text().strip() == req_hash:
             self.logger.debug("Requirements already installed (hash match)")
             return
         rc, out, err = run_cmd([str(pip_path), "install", "-r", str(req_path), "--quiet", "--disable-pip-version-check"], timeout=300)
         if rc != 0:
             raise RuntimeError(f"pip install failed: {err}")
-        hash_file.write_text(str(req_hash))
+        hash_file.write_text(req_hash)
+
+def uses_only_stdlib(entry_path: Path) -> bool:
+    """True if entry_path, and every local module it imports, imports only the stdlib.
+
+    Local modules resolve next to the entry script (sys.path[0]); they are
+    scanned in turn, a package as all of its .py files.
+    """
+    stdlib = getattr(sys, "stdlib_module_names", None)
+    if stdlib is None:  # Python < 3.10 cannot tell; keep using a venv
+        return False
+    search_dir = entry_path.parent
+    pending = [entry_path]
+    seen = set()
+    while pending:
+        path = pending.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        try:
+            tree = ast.parse(path.read_bytes())
+        except (SyntaxError, ValueError, OSError):
+            return False
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and not node.level:
+                names = [node.module or ""]
+            else:
+                continue
+            for name in names:
+                top = name.split(".")[0]
+                if (search_dir / f"{top}.py").is_file():
+                    pending.append(search_dir / f"{top}.py")
+                elif (search_dir / top).is_dir():
+                    pending.extend((search_dir / top).rglob("*.py"))
+                elif top not in stdlib:
+                    return False
+    return True
 
 # -------------------- C++ Build System --------------------
 
+_UNSET = object()
+_WORKING_RE = re.compile("working", re.IGNORECASE)
+# NAME=value lines of cmd's `set`; skips the "=C:=C:\..." per-drive pseudo variables
+_SET_LINE_RE = re.compile(r"^([^=\r\n]+)=([^\r\n]*)", re.MULTILINE)
+# Variables vcvars builds on; a change in any of them invalidates the persisted capture
+_MSVC_ENV_INPUTS = ("PATH", "INCLUDE", "LIB", "LIBPATH")
+
+def _msvc_env_key() -> str:
+    data = "\0".join(os.environ.get(name, "") for name in _MSVC_ENV_INPUTS)
+    return hashlib.blake2b(data.encode("utf-8"), digest_size=16).hexdigest()
+
 class CppBuilder:
+    # vcvars environment captured once per process (shared by all builders)
+    _MSVC_ENV_CACHE: Union[object, Optional[Dict[str, str]]] = _UNSET
     def __init__(self, root: Path, logger: logging.Logger):
         self.root = root
         self.logger = logger
         self._tool_env_cache = None
+        self._has_ninja = which("ninja") is not None
     def build_and_run(self, config: CppConfig) -> TestResult:
         start_time = time.time()
         try:
@@ -359,16 +578,16 @@ class CppBuilder:
         return None
     def _setup_build_environment(self, config: CppConfig) -> Dict[str, str]:
         base_env = self._get_tool_env() or os.environ.copy()
-        if platform.system() == "Windows" and not config.force_compiler:
+        if _IS_WINDOWS and not config.force_compiler:
             msvc_env = self._try_capture_msvc_env()
             if msvc_env:
                 base_env.update(msvc_env)
         return base_env
     def _configure_project(self, cmake: str, source_dir: Path, build_dir: Path, config: CppConfig, env: Dict[str, str]) -> bool:
         args = [cmake, "-S", str(source_dir), "-B", str(build_dir)]
-        if which("ninja") or self._get_tool_env():
+        if self._has_ninja or self._get_tool_env():
             args.extend(["-G", "Ninja"])
-        elif platform.system() == "Windows":
+        elif _IS_WINDOWS:
             args.extend(["-G", "Visual Studio 17 2022"])
         args.append(f"-DCMAKE_BUILD_TYPE={config.build_type}")
         if config.force_compiler:
@@ -385,8 +604,7 @@ class CppBuilder:
         return True
     def _build_project(self, cmake: str, build_dir: Path, config: CppConfig, env: Dict[str, str]) -> bool:
         args = [cmake, "--build", str(build_dir), "--config", config.build_type]
-        if platform.system() != "Windows":
-            import multiprocessing
+        if not _IS_WINDOWS:
             args.extend(["--parallel", str(multiprocessing.cpu_count())])
         self.logger.info(f"Building project...")
         rc, out, err = run_cmd(args, env=env, timeout=config.timeout)
@@ -395,23 +613,27 @@ class CppBuilder:
             return False
         return True
     def _find_executable(self, build_dir: Path, config: CppConfig) -> Optional[Path]:
-        exe_name = config.target + (".exe" if platform.system() == "Windows" else "")
+        exe_name = config.target + (".exe" if _IS_WINDOWS else "")
         candidates = [
             build_dir / exe_name,
             build_dir / config.build_type / exe_name,
             build_dir / "Debug" / exe_name,
             build_dir / "Release" / exe_name,
         ]
-        candidates.extend(build_dir.rglob(exe_name))
         for candidate in candidates:
-            if candidate.exists() and candidate.is_file():
+            if candidate.is_file():
                 return candidate
+        # Last resort: search the build tree, skipping CMakeFiles (never holds the target)
+        for dirpath, dirnames, filenames in os.walk(build_dir):
+            dirnames[:] = [d for d in dirnames if d != "CMakeFiles"]
+            if exe_name in filenames:
+                return Path(dirpath) / exe_name
         return None
     def _run_executable(self, exe_path: Path, config: CppConfig, env: Dict[str, str], start_time: float) -> TestResult:
         self.logger.info(f"Running: {exe_path}")
-        rc, out, err = run_cmd([str(exe_path)] + config.args, cwd=str(exe_path.parent), env=env, timeout=config.timeout)
-        combined_output = (out + err).lower()
-        success = rc == 0 and "working" in combined_output
+        rc, out, err, matched = run_cmd_expect([str(exe_path)] + config.args, _WORKING_RE,
+                                               cwd=str(exe_path.parent), env=env, timeout=config.timeout)
+        success = rc == 0 and matched
         status = "PASS" if success else "FAIL"
         duration = time.time() - start_time
         return TestResult(status, duration, out, err, return_code=rc)
@@ -420,28 +642,28 @@ class CppBuilder:
     def _ensure_tool_venv(self) -> Tuple[str, Dict[str, str], bool]:
         if self._tool_env_cache:
             toolvenv = self.root / ".devcheck" / "toolvenv"
-            bin_dir = toolvenv / ("Scripts" if platform.system() == "Windows" else "bin")
-            cmake = bin_dir / ("cmake.exe" if platform.system() == "Windows" else "cmake")
-            ninja = bin_dir / ("ninja.exe" if platform.system() == "Windows" else "ninja")
+            bin_dir = toolvenv / ("Scripts" if _IS_WINDOWS else "bin")
+            cmake = bin_dir / ("cmake.exe" if _IS_WINDOWS else "cmake")
+            ninja = bin_dir / ("ninja.exe" if _IS_WINDOWS else "ninja")
             return str(cmake), self._tool_env_cache, ninja.exists()
         toolvenv = self.root / ".devcheck" / "toolvenv"
         if not toolvenv.exists():
             rc, _, err = run_cmd([sys.executable, "-m", "venv", str(toolvenv)])
             if rc != 0:
                 raise RuntimeError(f"Failed to create tool venv: {err}")
-        bin_dir = toolvenv / ("Scripts" if platform.system() == "Windows" else "bin")
-        pip = bin_dir / ("pip.exe" if platform.system() == "Windows" else "pip")
+        bin_dir = toolvenv / ("Scripts" if _IS_WINDOWS else "bin")
+        pip = bin_dir / ("pip.exe" if _IS_WINDOWS else "pip")
         rc, _, err = run_cmd([str(pip), "install", "-q", "cmake>=3.26", "ninja"])
         if rc != 0:
             raise RuntimeError(f"Failed to install tools: {err}")
-        cmake = bin_dir / ("cmake.exe" if platform.system() == "Windows" else "cmake")
-        ninja = bin_dir / ("ninja.exe" if platform.system() == "Windows" else "ninja")
+        cmake = bin_dir / ("cmake.exe" if _IS_WINDOWS else "cmake")
+        ninja = bin_dir / ("ninja.exe" if _IS_WINDOWS else "ninja")
         env = os.environ.copy()
         env["PATH"] = str(bin_dir) + os.pathsep + env.get("PATH", "")
         self._tool_env_cache = env
         return str(cmake), env, ninja.exists()
     def _find_vs_cmake(self) -> Optional[str]:
-        if platform.system() != "Windows":
+        if not _IS_WINDOWS:
             return None
         bases = [Path(r"C:\Program Files\Microsoft Visual Studio\2022"),
                  Path(r"C:\Program Files (x86)\Microsoft Visual Studio\2022")]
@@ -452,8 +674,28 @@ class CppBuilder:
                     return str(cmake_path)
         return None
     def _try_capture_msvc_env(self) -> Optional[Dict[str, str]]:
-        if platform.system() != "Windows":
+        if not _IS_WINDOWS:
             return None
+        if CppBuilder._MSVC_ENV_CACHE is not _UNSET:
+            return CppBuilder._MSVC_ENV_CACHE
+        cache_path = self.root / ".devcheck" / "msvc_env.json"
+        env = self._load_msvc_env_cache(cache_path)
+        if env is None:
+            env = self._capture_msvc_env(cache_path)
+        CppBuilder._MSVC_ENV_CACHE = env
+        return env
+    def _load_msvc_env_cache(self, cache_path: Path) -> Optional[Dict[str, str]]:
+        """Reuse a persisted vcvars environment while the VS installation and its inputs are unchanged."""
+        try:
+            cached = json.loads(cache_path.read_text(encoding="utf-8"))
+            if (cached["envKey"] == _msvc_env_key()
+                    and Path(cached["installationPath"]).stat().st_mtime_ns == cached["mtime"]):
+                self.logger.debug(f"Using cached MSVC environment from {cache_path}")
+                return cached["env"]
+        except Exception:
+            pass
+        return None
+    def _capture_msvc_env(self, cache_path: Path) -> Optional[Dict[str, str]]:
         vswhere = Path(r"C:\Program Files (x86)\Microsoft Visual Studio\Installer\vswhere.exe")
         if not vswhere.exists():
             return None
@@ -469,31 +711,48 @@ class CppBuilder:
                 cmd = f'"{batch_file}" -no_logo && set'
                 rc, out, err = run_cmd(["cmd.exe", "/s", "/c", cmd])
                 if rc == 0 and out:
-                    env = {}
-                    for line in out.splitlines():
-                        if "=" in line and not line.startswith("="):
-                            key, value = line.split("=", 1)
-                            env[key] = value
+                    # `set` dumps the whole environment; keep only what vcvars changed so
+                    # unrelated (possibly secret) variables are never written to disk
+                    current = {k.upper(): v for k, v in os.environ.items()}
+                    env = {k: v for k, v in _SET_LINE_RE.findall(out) if current.get(k.upper()) != v}
+                    try:
+                        cache_path.parent.mkdir(parents=True, exist_ok=True)
+                        cache_path.write_text(json.dumps({"installationPath": str(vs_root),
+                                                          "mtime": vs_root.stat().st_mtime_ns,
+                                                          "envKey": _msvc_env_key(),
+                                                          "env": env}), encoding="utf-8")
+                    except OSError:
+                        pass
                     return env
         return None
 
 # -------------------- Test Runners --------------------
 
-def run_python_project(project: PythonProject, root: Path, py_env: PythonEnvironment) -> Dict:
+def run_python_project(project: PythonProject, root: Path, py_env: Optional[PythonEnvironment] = None) -> Dict:
     logger = logging.getLogger('devcheck')
     start_time = time.time()
+    # Worker processes get a fresh environment; on-disk venvs are reused across workers.
+    if py_env is None:
+        py_env = PythonEnvironment(root, logger)
     try:
         proj_dir = root / project.path
         logger.info(f"Testing Python project: {project.path}")
-        venv_dir, vpy, pip = py_env.ensure_venv(proj_dir, project)
-        py_env.install_requirements(proj_dir, pip, project)
         entry_path = proj_dir / project.entry
         if not entry_path.exists():
             raise FileNotFoundError(f"Entry script not found: {entry_path}")
+        req_path = proj_dir / (project.requirements or "requirements.txt")
+        if not project.python_version and not req_path.exists() and uses_only_stdlib(entry_path):
+            # Nothing to install: a venv would only add seconds of bootstrap
+            logger.debug(f"Stdlib-only entry, using {sys.executable}")
+            vpy = Path(sys.executable)
+        else:
+            venv_dir, vpy, pip = py_env.ensure_venv(proj_dir, project)
+            py_env.install_requirements(proj_dir, venv_dir, pip, project)
         logger.debug(f"Running: {entry_path}")
-        rc, out, err = run_cmd([str(vpy), str(entry_path)], cwd=str(proj_dir), timeout=project.timeout)
-        combined_output = (out + err).lower()
-        success = rc == 0 and project.expect.lower() in combined_output
+        expect = re.compile(re.escape(project.expect), re.IGNORECASE)
+        rc, out, err, matched = run_cmd_expect([str(vpy), str(entry_path)], expect,
+                                               cwd=str(proj_dir), timeout=project.timeout)
+        success = rc == 0 and matched
         status = "PASS" if success else "FAIL"
         duration = time.time() - start_time
         result = {
@@ -520,30 +779,59 @@ def run_python_project(project: PythonProject, root: Path, py_env: PythonEnviron
             "stderr": str(e)
         }
 
-def run_tests_parallel(projects: List[PythonProject], root: Path, 
-                      py_env: PythonEnvironment, max_workers: int = 4) -> List[Dict]:
+def create_process_pool(max_workers: int) -> ProcessPoolExecutor:
+    """Process pool whose workers set up the 'devcheck' logger like the parent.
+
+    "spawn" keeps behaviour identical on Windows.
+    """
+    logger = logging.getLogger('devcheck')
+    verbose = logger.isEnabledFor(logging.DEBUG)
+    no_color = any(getattr(h.formatter, "no_color", False) for h in logger.handlers)
+    return ProcessPoolExecutor(max_workers=max_workers,
+                               mp_context=multiprocessing.get_context("spawn"),
+                               initializer=setup_logging,
+                               initargs=(verbose, no_color))
+
+def run_python_project_batch(projects: List[PythonProject], root: Path) -> List[Dict]:
+    """Run projects sequentially in one worker, sharing a single PythonEnvironment."""
+    py_env = PythonEnvironment(root, logging.getLogger('devcheck'))
+    return [run_python_project(project, root, py_env) for project in projects]
+
+def run_tests_parallel(projects: List[PythonProject], root: Path, max_workers: int = 4,
+                       pool: Optional[ProcessPoolExecutor] = None) -> List[Dict]:
     logger = logging.getLogger('devcheck')
     if not projects:
         return []
     results = []
-    with ThreadPoolExecutor(max_workers=min(max_workers, len(projects))) as executor:
-        future_to_project = {executor.submit(run_python_project, proj, root, py_env): proj for proj in projects}
-        for future in as_completed(future_to_project):
+    # Projects sharing an interpreter are batched together, split so every worker still gets work.
+    groups: Dict[str, List[PythonProject]] = defaultdict(list)
+    for proj in projects:
+        groups[proj.python_version or "default"].append(proj)
+    batch_size = -(-len(projects) // max_workers)
+    batches = [group[i:i + batch_size] for group in groups.values() for i in range(0, len(group), batch_size)]
+    own_pool = pool is None
+    if own_pool:
+        pool = create_process_pool(min(max_workers, len(batches)))
+    try:
+        future_to_batch = {pool.submit(run_python_project_batch, batch, root): batch for batch in batches}
+        for future in as_completed(future_to_batch):
             try:
-                result = future.result()
-                results.append(result)
+                results.extend(future.result())
             except Exception as e:
-                project = future_to_project[future]
-                logger.error(f"Failed to run project {project.path}: {e}")
-                results.append({
-                    "path": str(root / project.path),
-                    "entry": project.entry,
-                    "status": "FAIL",
-                    "duration": 0,
-                    "return_code": -1,
-                    "stdout": "",
-                    "stderr": str(e)
-                })
+                for project in future_to_batch[future]:
+                    logger.error(f"Failed to run project {project.path}: {e}")
+                    results.append({
+                        "path": str(root / project.path),
+                        "entry": project.entry,
+                        "status": "FAIL",
+                        "duration": 0,
+                        "return_code": -1,
+                        "stdout": "",
+                        "stderr": str(e)
+                    })
+    finally:
+        if own_pool:
+            pool.shutdown()
     return sorted(results, key=lambda r: r["path"])
 
 # -------------------- Main Function --------------------
@@ -558,6 +846,7 @@ Examples:
   %(prog)s --config myconfig.json            # Use custom config
   %(prog)s --verbose --parallel              # Verbose output with parallel execution
   %(prog)s --timeout 600 --max-workers 2     # Custom timeouts and worker count
+  %(prog)s --html                            # Also write the HTML report
         """
     )
     parser.add_argument("--config", default="devcheck.json", help="Path to config JSON (default: %(default)s)")
@@ -567,16 +856,11 @@ Examples:
     parser.add_argument("--max-workers", type=int, default=4, help="Maximum parallel workers (default: %(default)s)")
     parser.add_argument("--timeout", type=int, default=300, help="Default timeout for operations (default: %(default)s)")
     parser.add_argument("--no-color", action="store_true", help="Disable colored output")
+    parser.add_argument("--html", action="store_true", help="Also write an HTML report (.devcheck/test_report.html)")
     args = parser.parse_args()
 
     # Setup logging
-    logger = setup_logging(args.verbose)
-    if args.no_color:
-        original_emit = logging.StreamHandler.emit
-        def no_color_emit(self, record):
-            record.no_color = True
-            return original_emit(self, record)
-        logging.StreamHandler.emit = no_color_emit
+    logger = setup_logging(args.verbose, args.no_color)
 
     # Initialize
     root = Path(args.root).resolve()
@@ -589,57 +873,64 @@ Examples:
     python_projects = config.get("python_projects") or discover_python_projects(root)
     cpp_config = config.get("cpp") or CppConfig()
 
-    # ---- Mandatory cleanup BEFORE any work ----
-    mandatory_cleanup(root, cpp_config)
-
-    # Override timeouts from command line
-    if hasattr(cpp_config, 'timeout'):
-        cpp_config.timeout = args.timeout
-    for proj in python_projects:
-        if hasattr(proj, 'timeout'):
-            proj.timeout = min(proj.timeout, args.timeout)
-
-    # Results tracking
-    results = {
-        "python": [],
-        "cpp": None,
-        "started_at": time.strftime("%Y-%m-%d %H:%M:%S"),
-        "config": {
-            "root": str(root),
-            "parallel": args.parallel,
-            "max_workers": args.max_workers,
-            "timeout": args.timeout,
-        },
-        "system_info": {
-            "platform": platform.platform(),
-            "python_version": sys.version,
-            "architecture": platform.architecture()[0],
+    # One process pool (only with --parallel) shared by cleanup and the Python runs
+    with (create_process_pool(args.max_workers) if args.parallel else nullcontext()) as pool:
+        # ---- Mandatory cleanup BEFORE any work ----
+        mandatory_cleanup(root, cpp_config, pool=pool)
+
+        # Override timeouts from command line
+        if hasattr(cpp_config, 'timeout'):
+            cpp_config.timeout = args.timeout
+        for proj in python_projects:
+            if hasattr(proj, 'timeout'):
+                proj.timeout = min(proj.timeout, args.timeout)
+
+        # The C++ build is independent of the Python checks: run it in the background meanwhile
+        cpp_executor = ThreadPoolExecutor(max_workers=1)
+        cpp_builder = CppBuilder(root, PrefixAdapter(logger, {"prefix": "c++"}))
+        cpp_future = cpp_executor.submit(cpp_builder.build_and_run, cpp_config)
+
+        # Results tracking
+        results = {
+            "python": [],
+            "cpp": None,
+            "started_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "config": {
+                "root": str(root),
+                "parallel": args.parallel,
+                "max_workers": args.max_workers,
+                "timeout": args.timeout,
+            },
+            "system_info": {
+                "platform": platform.platform(),
+                "python_version": sys.version,
+                "architecture": platform.architecture()[0],
+            }
         }
-    }
-    overall_success = True
+        overall_success = True
 
-    # Run Python tests
-    print_header("PYTHON PROJECT CHECKS")
-    if not python_projects:
-        logger.info("No Python projects found")
-    else:
-        py_env = PythonEnvironment(root, logger)
-        if args.parallel and len(python_projects) > 1:
-            logger.info(f"Running {len(python_projects)} Python projects in parallel (max workers: {args.max_workers})")
-            results["python"] = run_tests_parallel(python_projects, root, py_env, args.max_workers)
+        # Run Python tests
+        print_header("PYTHON PROJECT CHECKS")
+        if not python_projects:
+            logger.info("No Python projects found")
         else:
-            for project in python_projects:
-                result = run_python_project(project, root, py_env)
-                results["python"].append(result)
-        failed_py = [r for r in results["python"] if r["status"] == "FAIL"]
-        if failed_py:
-            overall_success = False
-            logger.error(f"{len(failed_py)} Python project(s) failed")
+            py_env = PythonEnvironment(root, logger)
+            if args.parallel and len(python_projects) > 1:
+                logger.info(f"Running {len(python_projects)} Python projects in parallel (max workers: {args.max_workers})")
+                results["python"] = run_tests_parallel(python_projects, root, args.max_workers, pool=pool)
+            else:
+                for project in python_projects:
+                    result = run_python_project(project, root, py_env)
+                    results["python"].append(result)
+            failed_py = [r for r in results["python"] if r["status"] == "FAIL"]
+            if failed_py:
+                overall_success = False
+                logger.error(f"{len(failed_py)} Python project(s) failed")
 
     # Run C++ tests
     print_header("C++ (CMAKE) CHECK")
-    cpp_builder = CppBuilder(root, logger)
-    cpp_result = cpp_builder.build_and_run(cpp_config)
+    cpp_result = cpp_future.result()
+    cpp_executor.shutdown()
     results["cpp"] = {
         "status": cpp_result.status,
         "duration": cpp_result.duration,
@@ -684,14 +975,22 @@ Examples:
     report_dir = root / ".devcheck"
     report_dir.mkdir(parents=True, exist_ok=True)
     report_path = report_dir / "test_report.json"
-    with report_path.open("w", encoding="utf-8") as f:
-        json.dump(results, f, indent=2, default=str)
     html_report_path = report_dir / "test_report.html"
-    try:
-        generate_html_report(results, output_path= report_dir)
-        logger.info(f"HTML report: {html_report_path}")
-    except Exception as e:
-        logger.warning(f"Failed to generate HTML report: {e}")
+    with ThreadPoolExecutor(max_workers=1) as report_executor:
+        # Render/write the HTML report in the background while the JSON report is written
+        html_future = report_executor.submit(generate_html_report, results, html_report_path) if args.html else None
+        if orjson is not None:
+            report_path.write_bytes(orjson.dumps(results, default=str, option=orjson.OPT_INDENT_2))
+        else:
+            # Machine-read report: compact separators keep serialization cheap
+            with report_path.open("w", encoding="utf-8", buffering=1 << 20) as f:
+                json.dump(results, f, separators=(",", ":"), default=str)
+    if html_future is not None:
+        try:
+            html_future.result()
+            logger.info(f"HTML report: {html_report_path}")
+        except Exception as e:
+            logger.warning(f"Failed to generate HTML report: {e}")
     logger.info(f"JSON report: {report_path}")
 
     if overall_success:
@@ -701,205 +1000,244 @@ Examples:
         print(f"\n Some tests failed!")
         sys.exit(1)
 
-def generate_html_report(results: Dict, output_path: Path) -> None:
-    """Render a nice HTML report to the given output_path."""
-    # ---------- summary ----------
-    all_results = list(results.get("python", []))
-    if results.get("cpp"):
-        all_results.append(results["cpp"])
+# ---------- report template: static parts are written verbatim, only the header is rendered ----------
+_HTML_DOC_OPEN = """\
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>DevCheck Test Report</title>
+    <style>
+"""
+_HTML_DOC_OPEN_BYTES = _HTML_DOC_OPEN.encode("ascii")
 
-    total_tests = len(all_results)
-    passed = sum(1 for r in all_results if (r or {}).get("status") == "PASS")
-    failed = sum(1 for r in all_results if (r or {}).get("status") == "FAIL")
-    skipped = sum(1 for r in all_results if (r or {}).get("status") == "SKIP")
-    total_duration = sum(float((r or {}).get("duration", 0) or 0) for r in all_results)
-
-    # ---------- sections ----------
-    sections = []
-
-    # Python tests
-    if results.get("python"):
-        python_items = []
-        for test in results["python"]:
-            test = test or {}
-            name = str(test.get("path", "(unknown)"))
-            entry = str(test.get("entry", "(unknown)"))
-            status = str(test.get("status", "UNKNOWN"))
-            duration = float(test.get("duration", 0) or 0)
-            rc = int(test.get("return_code", 0) or 0)
-
-            stdout_txt = str(test.get("stdout", "") or "")
-            stderr_txt = str(test.get("stderr", "") or "")
-
-            status_class = status.lower()
-            output_sections = []
-            if stdout_txt:
-                output_sections.append(
-                    f'<div class="test-output">{escape_html(stdout_txt)}</div>'
-                )
-            if stderr_txt:
-                output_sections.append(
-                    f'<div class="test-output error">{escape_html(stderr_txt)}</div>'
-                )
-            outputs = "".join(output_sections)
-            collapsible_class = "collapsible" if outputs else ""
-
-            python_items.append(f"""
-                <div class="test-item {status_class} {collapsible_class}">
-                    <div class="test-header">
-                        <div class="test-title">{escape_html(name)} :: {escape_html(entry)}</div>
-                        <div class="test-status {status_class}">{escape_html(status)}</div>
-                    </div>
-                    <div class="test-details">
-                        Duration: {duration:.2f}s | Return Code: {rc}
-                    </div>
-                    {f'<div class="collapsible-content">{outputs}</div>' if outputs else ''}
-                </div>
-            """)
-
-        sections.append(f"""
-            <div class="section">
-                <h2>Python Projects ({len(results["python"])} tests)</h2>
-                <div class="test-grid">
-                    {"".join(python_items)}
-                </div>
-            </div>
-        """)
-
-    # C++ test
-    if results.get("cpp"):
-        cpp = results["cpp"] or {}
-        status = str(cpp.get("status", "UNKNOWN"))
-        status_class = status.lower()
-        cpp_duration = float(cpp.get("duration", 0) or 0)
-        cpp_rc = int(cpp.get("return_code", 0) or 0)
-
-        output_sections = []
-        if cpp.get("stdout"):
-            output_sections.append(f'<div class="test-output">{escape_html(str(cpp["stdout"]))}</div>')
-        if cpp.get("stderr"):
-            output_sections.append(f'<div class="test-output error">{escape_html(str(cpp["stderr"]))}</div>')
-        if cpp.get("error_message"):
-            output_sections.append(f'<div class="test-output error">{escape_html(str(cpp["error_message"]))}</div>')
-
-        outputs = "".join(output_sections)
-        collapsible_class = "collapsible" if outputs else ""
-
-        sections.append(f"""
-            <div class="section">
-                <h2>C++ Project</h2>
-                <div class="test-grid">
-                    <div class="test-item {status_class} {collapsible_class}">
-                        <div class="test-header">
-                            <div class="test-title">CMake Build & Run</div>
-                            <div class="test-status {status_class}">{escape_html(status)}</div>
-                        </div>
-                        <div class="test-details">
-                            Duration: {cpp_duration:.2f}s | Return Code: {cpp_rc}
-                        </div>
-                        {f'<div class="collapsible-content">{outputs}</div>' if outputs else ''}
-                    </div>
-                </div>
-            </div>
-        """)
-
-    # ---------- template (double the CSS braces!) ----------
-    html_template = """
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>DevCheck Test Report</title>
-        <style>
-            body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; line-height: 1.6; margin: 0; padding: 20px; background-color: #f5f5f5; }}
-            .container {{ max-width: 1200px; margin: 0 auto; background: white; border-radius: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); overflow: hidden; }}
-            .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; text-align: center; }}
-            .header h1 {{ margin: 0; font-size: 2.5em; font-weight: 300; }}
-            .summary {{ padding: 20px 30px; background: #f8f9fa; border-bottom: 1px solid #e9ecef; }}
-            .summary-grid {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 20px; margin-top: 15px; }}
-            .summary-card {{ background: white; padding: 20px; border-radius: 6px; border-left: 4px solid #007bff; box-shadow: 0 1px 3px rgba(0,0,0,0.1); }}
-            .summary-card h3 {{ margin: 0 0 10px 0; color: #495057; font-size: 0.9em; text-transform: uppercase; letter-spacing: 1px; }}
-            .summary-card .value {{ font-size: 1.8em; font-weight: bold; color: #212529; }}
-            .section {{ padding: 30px; }}
-            .section h2 {{ margin: 0 0 20px 0; color: #495057; border-bottom: 2px solid #e9ecef; padding-bottom: 10px; }}
-            .test-grid {{ display: grid; gap: 15px; }}
-            .test-item {{ background: #f8f9fa; border-radius: 6px; padding: 20px; border-left: 4px solid #6c757d; }}
-            .test-item.pass {{ border-left-color: #28a745; background: #f8fff9; }}
-            .test-item.fail {{ border-left-color: #dc3545; background: #fff8f8; }}
-            .test-item.skip {{ border-left-color: #ffc107; background: #fffef8; }}
-            .test-header {{ display: flex; justify-content: space-between; align-items: center; margin-bottom: 10px; }}
-            .test-title {{ font-weight: bold; color: #212529; }}
-            .test-status {{ padding: 4px 12px; border-radius: 20px; font-size: 0.8em; font-weight: bold; text-transform: uppercase; }}
-            .test-status.pass {{ background: #28a745; color: white; }}
-            .test-status.fail {{ background: #dc3545; color: white; }}
-            .test-status.skip {{ background: #ffc107; color: #212529; }}
-            .test-details {{ font-size: 0.9em; color: #6c757d; margin-bottom: 10px; }}
-            .test-output {{ background: #2d3748; color: #e2e8f0; padding: 15px; border-radius: 4px; font-family: 'Courier New', monospace; font-size: 0.8em; overflow-x: auto; max-height: 200px; overflow-y: auto; }}
-            .test-output.error {{ background: #742a2a; color: #fed7d7; }}
-            .collapsible {{ cursor: pointer; user-select: none; }}
-            .collapsible:hover {{ background: rgba(0,0,0,0.05); }}
-            .collapsible-content {{ display: none; margin-top: 15px; }}
-            .collapsible.active .collapsible-content {{ display: block; }}
-            .system-info {{ background: #e9ecef; padding: 15px; border-radius: 4px; font-size: 0.9em; margin-top: 15px; }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <h1>DevCheck Test Report</h1>
-                <p>Generated on {timestamp}</p>
+_STATIC_CSS = """\
+        body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; line-height: 1.6; margin: 0; padding: 20px; background-color: #f5f5f5; }
+        .container { max-width: 1200px; margin: 0 auto; background: white; border-radius: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); overflow: hidden; }
+        .header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; text-align: center; }
+        .header h1 { margin: 0; font-size: 2.5em; font-weight: 300; }
+        .summary { padding: 20px 30px; background: #f8f9fa; border-bottom: 1px solid #e9ecef; }
+        .summary-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 20px; margin-top: 15px; }
+        .summary-card { background: white; padding: 20px; border-radius: 6px; border-left: 4px solid #007bff; box-shadow: 0 1px 3px rgba(0,0,0,0.1); }
+        .summary-card h3 { margin: 0 0 10px 0; color: #495057; font-size: 0.9em; text-transform: uppercase; letter-spacing: 1px; }
+        .summary-card .value { font-size: 1.8em; font-weight: bold; color: #212529; }
+        .section { padding: 30px; }
+        .section h2 { margin: 0 0 20px 0; color: #495057; border-bottom: 2px solid #e9ecef; padding-bottom: 10px; }
+        .test-grid { display: grid; gap: 15px; }
+        .test-item { background: #f8f9fa; border-radius: 6px; padding: 20px; border-left: 4px solid #6c757d; }
+        .test-item.pass { border-left-color: #28a745; background: #f8fff9; }
+        .test-item.fail { border-left-color: #dc3545; background: #fff8f8; }
+        .test-item.skip { border-left-color: #ffc107; background: #fffef8; }
+        .test-header { display: flex; justify-content: space-between; align-items: center; margin-bottom: 10px; }
+        .test-title { font-weight: bold; color: #212529; }
+        .test-status { padding: 4px 12px; border-radius: 20px; font-size: 0.8em; font-weight: bold; text-transform: uppercase; }
+        .test-status.pass { background: #28a745; color: white; }
+        .test-status.fail { background: #dc3545; color: white; }
+        .test-status.skip { background: #ffc107; color: #212529; }
+        .test-details { font-size: 0.9em; color: #6c757d; margin-bottom: 10px; }
+        .test-output { background: #2d3748; color: #e2e8f0; padding: 15px; border-radius: 4px; font-family: 'Courier New', monospace; font-size: 0.8em; overflow-x: auto; max-height: 200px; overflow-y: auto; }
+        .test-output.error { background: #742a2a; color: #fed7d7; }
+        .collapsible { cursor: pointer; user-select: none; }
+        .collapsible:hover { background: rgba(0,0,0,0.05); }
+        .collapsible-content { display: none; margin-top: 15px; }
+        .collapsible.active .collapsible-content { display: block; }
+        .system-info { background: #e9ecef; padding: 15px; border-radius: 4px; font-size: 0.9em; margin-top: 15px; }
+"""
+
+
+def _minify_css(css: str) -> str:
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.DOTALL)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([:;{},])\s*", r"\1", css)
+    return css.replace(";}", "}").strip() + "\n"
+
+# Minified once at import; the readable version above stays the source of truth
+_STATIC_CSS_MIN = _minify_css(_STATIC_CSS)
+_STATIC_CSS_BYTES = _STATIC_CSS_MIN.encode("ascii")
+
+def _render_head(timestamp: str, total_tests: int, passed: int, failed: int, skipped: int,
+                 duration: float, platform_name: str, python_version: str, architecture: str) -> str:
+    """Report header after the CSS (an f-string: no runtime format-spec parsing)."""
+    return f"""\
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>DevCheck Test Report</h1>
+            <p>Generated on {escape_html(timestamp)}</p>
+        </div>
+        <div class="summary">
+            <h2>Summary</h2>
+            <div class="summary-grid">
+                <div class="summary-card"><h3>Total Tests</h3><div class="value">{total_tests}</div></div>
+                <div class="summary-card"><h3>Passed</h3><div class="value" style="color: #28a745;">{passed}</div></div>
+                <div class="summary-card"><h3>Failed</h3><div class="value" style="color: #dc3545;">{failed}</div></div>
+                <div class="summary-card"><h3>Skipped</h3><div class="value" style="color: #ffc107;">{skipped}</div></div>
+                <div class="summary-card"><h3>Duration</h3><div class="value">{duration:.1f}s</div></div>
             </div>
-            <div class="summary">
-                <h2>Summary</h2>
-                <div class="summary-grid">
-                    <div class="summary-card"><h3>Total Tests</h3><div class="value">{total_tests}</div></div>
-                    <div class="summary-card"><h3>Passed</h3><div class="value" style="color: #28a745;">{passed}</div></div>
-                    <div class="summary-card"><h3>Failed</h3><div class="value" style="color: #dc3545;">{failed}</div></div>
-                    <div class="summary-card"><h3>Skipped</h3><div class="value" style="color: #ffc107;">{skipped}</div></div>
-                    <div class="summary-card"><h3>Duration</h3><div class="value">{duration:.1f}s</div></div>
-                </div>
-                <div class="system-info">
-                    <strong>System:</strong> {platform}<br>
-                    <strong>Python:</strong> {python_version}<br>
-                    <strong>Architecture:</strong> {architecture}
-                </div>
+            <div class="system-info">
+                <strong>System:</strong> {escape_html(platform_name)}<br>
+                <strong>Python:</strong> {escape_html(python_version)}<br>
+                <strong>Architecture:</strong> {escape_html(architecture)}
             </div>
-            {sections}
         </div>
-        <script>
-            document.querySelectorAll('.collapsible').forEach(item => {{
-                item.addEventListener('click', function() {{
-                    this.classList.toggle('active');
-                }});
-            }});
-        </script>
-    </body>
-    </html>
+"""
+
+# Plain JS literal, never passed through a formatter (no brace doubling)
+_SCRIPT = """\
+    <script>
+        document.querySelectorAll('.collapsible').forEach(item => {
+            item.addEventListener('click', function() {
+                this.classList.toggle('active');
+            });
+        });
+    </script>
+"""
+_SCRIPT_BYTES = _SCRIPT.encode("ascii")
+
+# Closes .container, then the script and the document
+_HTML_TAIL_BYTES = b"    </div>\n" + _SCRIPT_BYTES + b"</body>\n</html>\n"
+
+def _render_row(name: str, entry: str, status_class: str, label: str,
+                duration: float, rc: int, outputs: str) -> str:
+    """One Python test row from already-escaped parts.
+
+    All fixed HTML is constant pieces of a single f-string, so a row is one
+    string build instead of a dozen separate writes.
     """
+    return (f'<div class="test-item {status_class}{" collapsible" if outputs else ""}">\n'
+            f'<div class="test-header">\n<div class="test-title">{name} :: {entry}</div>\n'
+            f'<div class="test-status {status_class}">{label}</div>\n</div>\n'
+            f'<div class="test-details">Duration: {duration:.2f}s | Return Code: {rc}</div>\n'
+            f'{outputs}</div>\n')
 
-    html = html_template.format(
-        timestamp=results.get("started_at", time.strftime("%Y-%m-%d %H:%M:%S")),
-        total_tests=total_tests,
-        passed=passed,
-        failed=failed,
-        skipped=skipped,
-        duration=total_duration,
-        platform=(results.get("system_info", {}) or {}).get("platform", "Unknown"),
-        python_version=(results.get("system_info", {}) or {}).get("python_version", "Unknown"),
-        architecture=(results.get("system_info", {}) or {}).get("architecture", "Unknown"),
-        sections="".join(sections),
-    )
+def _render_python_test(test: Dict) -> str:
+    stdout_txt = test.get("stdout") or ""
+    stderr_txt = test.get("stderr") or ""
+    outputs = ""
+    if stdout_txt or stderr_txt:
+        outputs = ('<div class="collapsible-content">'
+                   + (f'<div class="test-output">{escape_html(stdout_txt)}</div>' if stdout_txt else "")
+                   + (f'<div class="test-output error">{escape_html(stderr_txt)}</div>' if stderr_txt else "")
+                   + '</div>\n')
+    status_class, label = _status_html(test.get("status", "UNKNOWN"))
+    return _render_row(escape_html(test.get("path", "(unknown)")), escape_html(test.get("entry", "(unknown)")),
+                       status_class, label, test["duration"], test["return_code"], outputs)
+
+def _write_python_section(write, tests: List[Dict]) -> None:
+    """Write one report row per Python project result, streaming each as it is rendered."""
+    render = _render_python_test
+    for test in tests:
+        write(render(test))
+
+def generate_html_report(results: Dict, output_path: Path) -> None:
+    """Render a nice HTML report to the given output_path."""
+    # ---------- summary ----------
+    # Drop missing entries and coerce duration/return_code once, on shallow copies
+    # (results is being serialized to JSON concurrently and must not be mutated)
+    def normalized(r: Dict) -> Dict:
+        return {**r, "duration": float(r.get("duration") or 0), "return_code": int(r.get("return_code") or 0)}
+    python_results = [normalized(r) for r in (results.get("python") or []) if r]
+    cpp = normalized(results["cpp"]) if results.get("cpp") else None
+    all_results = python_results + ([cpp] if cpp else [])
+
+    total_tests = len(all_results)
+    passed = failed = skipped = 0
+    total_duration = 0.0
+    for r in all_results:
+        status = r.get("status")
+        if status == "PASS":
+            passed += 1
+        elif status == "FAIL":
+            failed += 1
+        elif status == "SKIP":
+            skipped += 1
+        total_duration += r["duration"]
 
+    # Fragments are streamed straight into a buffered file; the document is never held in memory
+    system_info = results.get("system_info", {}) or {}
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(html, encoding="utf-8")
+    with output_path.open("wb", buffering=1 << 16) as fh:
+        write_bytes = fh.write
+        def write(text: str) -> None:
+            write_bytes(text.encode("utf-8"))
+        # Invariant parts are pre-encoded once at import
+        write_bytes(_HTML_DOC_OPEN_BYTES)
+        write_bytes(_STATIC_CSS_BYTES)
+        write(_render_head(
+            timestamp=str(results.get("started_at", time.strftime("%Y-%m-%d %H:%M:%S"))),
+            total_tests=total_tests,
+            passed=passed,
+            failed=failed,
+            skipped=skipped,
+            duration=total_duration,
+            platform_name=str(system_info.get("platform", "Unknown")),
+            python_version=str(system_info.get("python_version", "Unknown")),
+            architecture=str(system_info.get("architecture", "Unknown")),
+        ))
+
+        # ---------- sections ----------
+        # Python tests
+        if python_results:
+            write(f'<div class="section">\n<h2>Python Projects ({len(python_results)} tests)</h2>\n<div class="test-grid">\n')
+            _write_python_section(write, python_results)
+            write('</div>\n</div>\n')
+
+        # C++ test
+        if cpp:
+            status = str(cpp.get("status", "UNKNOWN"))
+            status_class, label = _status_html(status)
+            cpp_duration = cpp["duration"]
+            cpp_rc = cpp["return_code"]
+
+            output_sections = []
+            if cpp.get("stdout"):
+                output_sections.append(("test-output", str(cpp["stdout"])))
+            if cpp.get("stderr"):
+                output_sections.append(("test-output error", str(cpp["stderr"])))
+            if cpp.get("error_message"):
+                output_sections.append(("test-output error", str(cpp["error_message"])))
+
+            write(f'<div class="section">\n<h2>C++ Project</h2>\n<div class="test-grid">\n'
+                  f'<div class="test-item {status_class}{" collapsible" if output_sections else ""}">\n'
+                  f'<div class="test-header">\n<div class="test-title">CMake Build &amp; Run</div>\n'
+                  f'<div class="test-status {status_class}">')
+            write(label)
+            write(f'</div>\n</div>\n<div class="test-details">Duration: {cpp_duration:.2f}s | Return Code: {cpp_rc}</div>\n')
+            if output_sections:
+                write('<div class="collapsible-content">')
+                for css_class, text in output_sections:
+                    write(f'<div class="{css_class}">')
+                    write(escape_html(text))
+                    write('</div>')
+                write('</div>\n')
+            write('</div>\n</div>\n</div>\n')
+
+        write_bytes(_HTML_TAIL_BYTES)
+
+# Invariant: escaping stays in C. The hot path is one compiled-regex search plus, only
+# when needed, one str.translate call (both tight loops over the raw string buffer).
+# Do not add Python-level per-character loops here; check with dis.dis(escape_html).
+_ESCAPE_TABLE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#x27;"})
+_NEEDS_ESCAPE = re.compile(r"[&<>\"']").search
+
+@functools.lru_cache(maxsize=4096)
+def _escape_cached(text: str) -> str:
+    # Repeated lines (tracebacks, banners, progress) are escaped once
+    return text.translate(_ESCAPE_TABLE)
 
 def escape_html(text: str) -> str:
-    return (text.replace("&", "&amp;")
-                .replace("<", "&lt;")
-                .replace(">", "&gt;")
-                .replace('"', "&quot;")
-                .replace("'", "&#x27;"))
+    if not _NEEDS_ESCAPE(text):
+        return text  # most output has nothing to escape: no copy at all
+    return _escape_cached(text)
+
+# Statuses come from a tiny fixed set: precompute (css class, escaped label) once
+_STATUS_HTML = {status: (status.lower(), escape_html(status)) for status in ("PASS", "FAIL", "SKIP", "UNKNOWN")}
+
+def _status_html(status: str) -> Tuple[str, str]:
+    return _STATUS_HTML.get(status) or (status.lower(), escape_html(status))
 
 if __name__ == "__main__":
     main()